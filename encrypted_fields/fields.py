@@ -1,15 +1,25 @@
 from __future__ import annotations
 
-import base64
+import binascii
+import contextlib
+import functools
+import hmac
 import json
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 from typing import Any
 
+from cryptography.exceptions import InvalidTag, UnsupportedAlgorithm
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.db.backends.base.base import BaseDatabaseWrapper
@@ -18,62 +28,323 @@ from django.db.models.expressions import Expression
 from django.utils.functional import cached_property
 
 _TypeAny = Any
+_TypeAEAD = AESGCM | ChaCha20Poly1305
+
+_NONCE_SIZE = 12  # Recommended size for GCM nonce is 12 bytes.
+_NONCE_POOL_SIZE = 4096
+_TAG_SIZE = 16
+# AEAD encrypt_into is only available in newer cryptography releases.
+_HAS_ENCRYPT_INTO = hasattr(AESGCM, "encrypt_into")
+
+
+def _aead_accepts_buffers() -> bool:
+    # Older cryptography releases only accept bytes as AEAD input.
+    aesgcm = AESGCM(bytes(32))
+    nonce = bytes(_NONCE_SIZE)
+    try:
+        aesgcm.decrypt(nonce, memoryview(aesgcm.encrypt(nonce, b"", None)), None)
+    except TypeError:
+        return False
+    return True
+
+
+_AEAD_ACCEPTS_BUFFERS = _aead_accepts_buffers()
+
+# Values of the ENCRYPTED_FIELDS_CIPHER setting.
+_CIPHERS = {"aesgcm": AESGCM, "chacha20": ChaCha20Poly1305}
+# Padded URL-safe base64, as produced by encrypt_value.
+_B64_RE = re.compile(r"[A-Za-z0-9_\-]*={0,2}")
+_B64_ENCODE_TABLE = bytes.maketrans(b"+/", b"-_")
+_B64_DECODE_TABLE = str.maketrans("-_", "+/")
+# Types produced by json.loads, dispatched on by identity in the JSON walkers.
+_JSON_TYPES = frozenset({dict, list, str, int, float, bool, type(None)})
+# Smaller batches are decrypted inline, thread hand-off would dominate.
+_BULK_DECRYPT_MIN_CHUNK = 64
+
+_nonce_pool = threading.local()
+
+# Fields currently cleaning a value, so their to_python does not decrypt it
+# again. Kept in a context variable rather than on the field, which is shared
+# by every thread and request; other fields keep decrypting meanwhile. It is
+# checked for emptiness first, as hashing a field is relatively slow.
+_cleaning: ContextVar[frozenset[models.Field]] = ContextVar(
+    "_cleaning", default=frozenset()
+)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # A forked child must never hand out nonces already buffered by its
+    # parent, and does not inherit the parent's worker threads.
+    global _nonce_pool, _executor, _executor_lock  # noqa: PLW0603
+    _nonce_pool = threading.local()
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _next_nonce() -> bytes:
+    # Slice nonces from a per-thread buffer of random bytes, refilling it
+    # from the OS CSPRNG once exhausted, instead of a syscall per nonce.
+    pool = _nonce_pool
+    buf = getattr(pool, "buf", b"")
+    offset = getattr(pool, "offset", 0)
+    if len(buf) - offset < _NONCE_SIZE:
+        buf = pool.buf = os.urandom(_NONCE_POOL_SIZE)
+        offset = 0
+    pool.offset = offset + _NONCE_SIZE
+    return buf[offset : offset + _NONCE_SIZE]
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # Shared by all fields, created on first use of bulk_decrypt.
+    global _executor  # noqa: PLW0603
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                thread_name_prefix="encrypted-fields",
+            )
+        return _executor
+
+
+def _b64encode(data: bytes | bytearray) -> str:
+    # Same output as base64.urlsafe_b64encode, without its Python wrappers.
+    encoded = binascii.b2a_base64(data, newline=False)
+    return encoded.translate(_B64_ENCODE_TABLE).decode("ascii")
+
+
+def _b64decode(value: str) -> bytes:
+    return binascii.a2b_base64(value.translate(_B64_DECODE_TABLE))
+
+
+# Derived keys are cached by their inputs, so every field in the process
+# shares one derivation per secret and salt pair.
+@functools.cache
+def _derive_key(secret: bytes, salt: bytes) -> bytes:
+    # SECRET_KEY is high-entropy, so a single HKDF expansion is enough.
+    hkdf = HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        info=b"django-encrypted-fields",
+        backend=default_backend(),
+    )
+    return hkdf.derive(secret)
+
+
+@functools.cache
+def _derive_legacy_key(secret: bytes, salt: bytes) -> bytes:
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=100_000,
+        backend=default_backend(),
+    )
+    return kdf.derive(secret)
+
+
+def _key_id(key: bytes, cipher: str = "aesgcm") -> int:
+    # A one byte fingerprint of the key and cipher. Unlike the key's position
+    # in the settings it does not change when keys are rotated.
+    label = b"django-encrypted-fields key id"
+    if cipher != "aesgcm":
+        label += b" " + cipher.encode("utf-8")
+    return hmac.digest(key, label, "sha256")[0]
+
+
+_VALIDATOR_CACHE: dict[
+    str, tuple[MinValueValidator | None, MaxValueValidator | None]
+] = {}
+
+
+def _range_validators(
+    internal_type: str,
+) -> tuple[MinValueValidator | None, MaxValueValidator | None]:
+    # The range of an integer column type is constant, so its validators are
+    # built once per process and shared between fields.
+    if internal_type not in _VALIDATOR_CACHE:
+        min_value, max_value = BaseDatabaseOperations.integer_field_ranges[internal_type]
+        _VALIDATOR_CACHE[internal_type] = (
+            None if min_value is None else MinValueValidator(min_value),
+            None if max_value is None else MaxValueValidator(max_value),
+        )
+    return _VALIDATOR_CACHE[internal_type]
 
 
 class EncryptedFieldMixin:
-    @cached_property
-    def keys(self) -> list[bytes]:
-        keys = []
+    # Set by fields whose encrypt_value/decrypt_value work on raw bytes, which
+    # are stored in a binary column instead of base64 encoded text.
+    _binary_column = False
+
+    @staticmethod
+    def _key_material() -> list[tuple[bytes, bytes]]:
         salt_keys = (
             settings.SALT_KEY
             if isinstance(settings.SALT_KEY, list)
             else [settings.SALT_KEY]
         )
         secret_keys = [settings.SECRET_KEY] + getattr(settings, "SECRET_KEY_FALLBACKS", list())
-        for secret_key in secret_keys:
-            for salt_key in salt_keys:
-                salt = bytes(salt_key, "utf-8")
-                kdf = PBKDF2HMAC(
-                    algorithm=hashes.SHA256(),
-                    length=32,
-                    salt=salt,
-                    iterations=100_000,
-                    backend=default_backend(),
-                )
-                keys.append(
-                    kdf.derive(secret_key.encode("utf-8"))
-                )
-        return keys
+        return [
+            (secret_key.encode("utf-8"), bytes(salt_key, "utf-8"))
+            for secret_key in secret_keys
+            for salt_key in salt_keys
+        ]
+
+    @cached_property
+    def keys(self) -> list[bytes]:
+        return [_derive_key(secret, salt) for secret, salt in self._key_material()]
+
+    @cached_property
+    def legacy_keys(self) -> list[bytes]:
+        # PBKDF2 keys used before the switch to HKDF, kept for decryption only.
+        # cryptography releases the GIL while deriving, so with several
+        # secret and salt pairs the derivations run in parallel. A private
+        # pool is used as this may itself run on a bulk_decrypt worker.
+        secrets, salts = zip(*self._key_material(), strict=True)
+        workers = min(len(secrets), os.cpu_count() or 1)
+        if workers == 1:
+            return list(map(_derive_legacy_key, secrets, salts))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_derive_legacy_key, secrets, salts))
+
+    @cached_property
+    def _aesgcms(self) -> list[AESGCM]:
+        # AESGCM instances are immutable and thread-safe, so build them once.
+        return [AESGCM(key) for key in self.keys]
+
+    @cached_property
+    def _legacy_aesgcms(self) -> list[AESGCM]:
+        return [AESGCM(key) for key in self.legacy_keys]
+
+    @cached_property
+    def _cipher(self) -> str:
+        cipher = getattr(settings, "ENCRYPTED_FIELDS_CIPHER", "aesgcm")
+        if cipher not in _CIPHERS:
+            msg = (
+                f"ENCRYPTED_FIELDS_CIPHER must be one of {', '.join(_CIPHERS)}, "
+                f"not {cipher!r}."
+            )
+            raise ImproperlyConfigured(msg)
+        return cipher
+
+    @cached_property
+    def _aead(self) -> _TypeAEAD:
+        # The cipher new values are encrypted with.
+        return _CIPHERS[self._cipher](self.keys[0])
+
+    @cached_property
+    def _aeads_by_id(self) -> dict[int, list[_TypeAEAD]]:
+        # Values written with either cipher stay readable after switching.
+        aeads = {}
+        for cipher, aead_class in _CIPHERS.items():
+            for key in self.keys:
+                try:
+                    aead = aead_class(key)
+                except UnsupportedAlgorithm:
+                    # e.g. ChaCha20Poly1305 on OpenSSL builds in FIPS mode.
+                    break
+                aeads.setdefault(_key_id(key, cipher), []).append(aead)
+        return aeads
+
+    @cached_property
+    def _key_prefix(self) -> bytes:
+        return bytes([_key_id(self.keys[0], self._cipher)])
+
+    def _encrypt_bytes(self, data: bytes) -> bytes | bytearray:
+        # Use the first key for encryption and name it in the first byte.
+        aead = self._aead
+        nonce = _next_nonce()
+        header = self._key_prefix + nonce
+        if not _HAS_ENCRYPT_INTO:
+            return header + aead.encrypt(nonce, data, None)
+        # Build the envelope in one buffer, with the ciphertext and tag
+        # written straight after the header.
+        encrypted = bytearray(len(header) + len(data) + _TAG_SIZE)
+        encrypted[: len(header)] = header
+        aead.encrypt_into(nonce, data, None, memoryview(encrypted)[len(header) :])
+        return encrypted
+
+    def _decrypt_bytes(self, encrypted: bytes | memoryview) -> bytes:
+        # Slicing a memoryview hands the ciphertext to the AEAD without copying.
+        view = memoryview(encrypted)
+        # Tagged values name their key and cipher, so only those are tried.
+        aeads = self._aeads_by_id.get(view[0]) if view else None
+        if aeads:
+            tagged = view[1:]
+            nonce, ciphertext = bytes(tagged[:_NONCE_SIZE]), tagged[_NONCE_SIZE:]
+            plaintext = self._try_decrypt(aeads, nonce, ciphertext)
+            if plaintext is not None:
+                return plaintext
+        # Untagged values from older releases start with the 12 byte nonce.
+        nonce, ciphertext = bytes(view[:_NONCE_SIZE]), view[_NONCE_SIZE:]
+        # Try decryption with each key for key rotation support.
+        plaintext = self._try_decrypt(self._aesgcms, nonce, ciphertext)
+        if plaintext is None:
+            # Fall back to the PBKDF2 keys for values written by older releases.
+            plaintext = self._try_decrypt(self._legacy_aesgcms, nonce, ciphertext)
+        if plaintext is None:
+            # If none of the keys worked, raise an exception.
+            raise ValueError("Decryption failed with all provided keys.")
+        return plaintext
 
     def encrypt_value(self, plaintext: str) -> str:
-        # Use the first key for encryption.
-        key = self.keys[0]
-        aesgcm = AESGCM(key)
-        nonce = os.urandom(12)  # Recommended size for GCM nonce is 12 bytes.
-        ciphertext = aesgcm.encrypt(nonce, plaintext.encode("utf-8"), None)
-        encrypted = nonce + ciphertext
-        return base64.urlsafe_b64encode(encrypted).decode("utf-8")
+        return _b64encode(self._encrypt_bytes(plaintext.encode("utf-8")))
 
     def decrypt_value(self, encrypted_value: str) -> str:
-        try:
-            encrypted = base64.urlsafe_b64decode(encrypted_value.encode("utf-8"))
-        except Exception:
+        if len(encrypted_value) % 4 or not _B64_RE.fullmatch(encrypted_value):
             # If it is not properly encoded, assume it is plain text.
             return encrypted_value
-        # The nonce is the first 12 bytes.
-        nonce, ciphertext = encrypted[:12], encrypted[12:]
-        # Try decryption with each key for key rotation support.
-        for key in self.keys:
-            aesgcm = AESGCM(key)
+        encrypted = _b64decode(encrypted_value)
+        return self._decrypt_bytes(encrypted).decode("utf-8")
+
+    def _decrypt_stored_value(self, value: str | None) -> _TypeAny:
+        # Decrypt a value as stored in the database column, NULL included.
+        if value is None:
+            return None
+        return self.decrypt_value(value)
+
+    def bulk_decrypt(self, values: list[str | None]) -> list[_TypeAny]:
+        # cryptography releases the GIL while decrypting, so large batches
+        # are split across a thread pool, one chunk per CPU.
+        workers = os.cpu_count() or 1
+        chunk_size = -(-len(values) // workers)
+        decrypt = self._decrypt_stored_value
+        if workers == 1 or chunk_size < _BULK_DECRYPT_MIN_CHUNK:
+            return [decrypt(value) for value in values]
+
+        def decrypt_chunk(chunk: list[str | None]) -> list[_TypeAny]:
+            return [decrypt(value) for value in chunk]
+
+        chunks = [
+            values[start : start + chunk_size]
+            for start in range(0, len(values), chunk_size)
+        ]
+        results = _get_executor().map(decrypt_chunk, chunks)
+        return [value for chunk in results for value in chunk]
+
+    @staticmethod
+    def _try_decrypt(
+        aeads: list[_TypeAEAD], nonce: bytes, ciphertext: bytes | memoryview
+    ) -> bytes | None:
+        if not _AEAD_ACCEPTS_BUFFERS:
+            ciphertext = bytes(ciphertext)
+        for aead in aeads:
             try:
-                plaintext = aesgcm.decrypt(nonce, ciphertext, None)
-                return plaintext.decode("utf-8")
-            except Exception:
+                return aead.decrypt(nonce, ciphertext, None)
+            except InvalidTag:
                 continue
-        # If none of the keys worked, raise an exception.
-        raise ValueError("Decryption failed with all provided keys.")
+        return None
 
     def get_internal_type(self) -> str:
+        if self._binary_column:
+            return "BinaryField"
         # Treat everything as text
         return "TextField"
 
@@ -104,10 +375,11 @@ class EncryptedFieldMixin:
         return self.to_python(value)
 
     def to_python(self, value: _TypeAny) -> _TypeAny:
+        encrypted_type = (bytes, memoryview) if self._binary_column else str
         if (
             value is None
-            or not isinstance(value, str)
-            or hasattr(self, "_already_decrypted")
+            or not isinstance(value, encrypted_type)
+            or ((cleaning := _cleaning.get()) and self in cleaning)
         ):
             return value
         try:
@@ -118,10 +390,11 @@ class EncryptedFieldMixin:
 
     def clean(self, value: _TypeAny, model_instance: models.Field) -> _TypeAny:
         # Prevent repeated decryption during form cleaning.
-        self._already_decrypted = True
-        ret = super().clean(value, model_instance)
-        del self._already_decrypted
-        return ret
+        token = _cleaning.set(_cleaning.get() | {self})
+        try:
+            return super().clean(value, model_instance)
+        finally:
+            _cleaning.reset(token)
 
 
 class EncryptedCharField(EncryptedFieldMixin, models.CharField):
@@ -141,9 +414,9 @@ class EncryptedIntegerField(EncryptedFieldMixin, models.IntegerField):
     def validators(self) -> list[MinValueValidator | MaxValueValidator]:
         # Validators are added based on connection information at runtime.
         validators_ = [*self.default_validators, *self._validators]
-        internal_type = models.IntegerField().get_internal_type()
-        min_value, max_value = BaseDatabaseOperations.integer_field_ranges[internal_type]
-        if min_value is not None and not any(
+        internal_type = models.IntegerField.get_internal_type(self)
+        min_validator, max_validator = _range_validators(internal_type)
+        if min_validator is not None and not any(
             (
                 isinstance(validator, MinValueValidator)
                 and (
@@ -151,12 +424,12 @@ class EncryptedIntegerField(EncryptedFieldMixin, models.IntegerField):
                     if callable(validator.limit_value)
                     else validator.limit_value
                 )
-                >= min_value
+                >= min_validator.limit_value
             )
             for validator in validators_
         ):
-            validators_.append(MinValueValidator(min_value))
-        if max_value is not None and not any(
+            validators_.append(min_validator)
+        if max_validator is not None and not any(
             (
                 isinstance(validator, MaxValueValidator)
                 and (
@@ -164,11 +437,11 @@ class EncryptedIntegerField(EncryptedFieldMixin, models.IntegerField):
                     if callable(validator.limit_value)
                     else validator.limit_value
                 )
-                <= max_value
+                <= max_validator.limit_value
             )
             for validator in validators_
         ):
-            validators_.append(MaxValueValidator(max_value))
+            validators_.append(max_validator)
         return validators_
 
 
@@ -188,32 +461,110 @@ class EncryptedBooleanField(EncryptedFieldMixin, models.BooleanField):
     pass
 
 
+class EncryptedBinaryField(EncryptedFieldMixin, models.BinaryField):
+    _binary_column = True
+
+    def encrypt_value(self, plaintext: bytes) -> bytes:
+        return bytes(self._encrypt_bytes(plaintext))
+
+    def decrypt_value(self, encrypted_value: bytes | memoryview) -> bytes:
+        return self._decrypt_bytes(encrypted_value)
+
+    def get_prep_value(self, value: _TypeAny) -> _TypeAny:
+        value = super(EncryptedFieldMixin, self).get_prep_value(value)
+        if value is None:
+            return None
+        return self.encrypt_value(bytes(value))
+
+    def to_python(self, value: _TypeAny) -> _TypeAny:
+        if isinstance(value, str):
+            # Serialized plaintext from value_to_string, which BinaryField
+            # decodes from base64.
+            return models.BinaryField.to_python(self, value)
+        return super().to_python(value)
+
+
 class EncryptedJSONField(EncryptedFieldMixin, models.JSONField):
     def _encrypt_values(self, value: _TypeAny) -> _TypeAny:
-        if isinstance(value, dict):
-            return {key: self._encrypt_values(data) for key, data in value.items()}
-        if isinstance(value, list):
-            return [self._encrypt_values(data) for data in value]
-        # Convert the value to a string and encrypt it.
-        plain = str(value)
-        return self.encrypt_value(plain)
+        # Walk the structure with an explicit stack rather than recursion.
+        # Containers are copied as they are visited so the caller's value is
+        # left untouched. Leaves are only collected here and encrypted
+        # together afterwards.
+        root = [value]
+        stack = [(root, 0)]
+        leaves = []
+        plaintexts = []
+        while stack:
+            container, key = stack.pop()
+            data = container[key]
+            data_type = type(data)
+            if data_type not in _JSON_TYPES:
+                # Subclasses such as OrderedDict are walked like their base.
+                if isinstance(data, dict):
+                    data_type = dict
+                elif isinstance(data, list):
+                    data_type = list
+            if data_type is dict:
+                data = container[key] = dict(data)
+                stack.extend((data, child) for child in data)
+            elif data_type is list:
+                data = container[key] = list(data)
+                stack.extend((data, index) for index in range(len(data)))
+            else:
+                # Convert the value to a string to be encrypted.
+                leaves.append((container, key))
+                plaintexts.append(str(data).encode("utf-8"))
+
+        # Encrypt every leaf in one loop over the same cipher, then write the
+        # envelopes, the same as _encrypt_bytes produces, back in place.
+        aead_encrypt = self._aead.encrypt
+        nonces = [_next_nonce() for _ in plaintexts]
+        ciphertexts = [
+            aead_encrypt(nonce, plaintext, None)
+            for nonce, plaintext in zip(nonces, plaintexts, strict=True)
+        ]
+        key_prefix = self._key_prefix
+        for (container, key), nonce, ciphertext in zip(
+            leaves, nonces, ciphertexts, strict=True
+        ):
+            container[key] = _b64encode(key_prefix + nonce + ciphertext)
+        return root[0]
 
     def _decrypt_values(self, value: _TypeAny) -> _TypeAny:
         if value is None:
             return value
-        if isinstance(value, dict):
-            return {key: self._decrypt_values(data) for key, data in value.items()}
-        if isinstance(value, list):
-            return [self._decrypt_values(data) for data in value]
-        # Attempt decryption; if it fails, return the value as-is.
-        try:
-            return self.decrypt_value(str(value))
-        except Exception:
-            return value
+        # The value comes straight from json.loads, so decrypt it in place.
+        decrypt = self.decrypt_value
+        root = [value]
+        stack = [(root, 0)]
+        while stack:
+            container, key = stack.pop()
+            data = container[key]
+            data_type = type(data)
+            if data_type is dict:
+                stack.extend((data, child) for child in data)
+            elif data_type is list:
+                stack.extend((data, index) for index in range(len(data)))
+            else:
+                # Attempt decryption; if it fails, keep the value as-is.
+                with contextlib.suppress(Exception):
+                    container[key] = decrypt(str(data))
+        return root[0]
+
+    def _decrypt_stored_value(self, value: str | None) -> _TypeAny:
+        # Stored values are JSON documents with encrypted leaves.
+        if value is None:
+            return None
+        return self._decrypt_values(json.loads(value))
+
+    @cached_property
+    def _encoder_instance(self) -> json.JSONEncoder:
+        # json.dumps(cls=...) would build a new encoder for every value.
+        return (self.encoder or json.JSONEncoder)()
 
     def get_prep_value(self, value: _TypeAny) -> str:
         # Encrypt each value within the JSON structure and then dump to JSON.
-        return json.dumps(self._encrypt_values(value=value), cls=self.encoder)
+        return self._encoder_instance.encode(self._encrypt_values(value=value))
 
     def get_internal_type(self) -> str:
         return "JSONField"
@@ -222,7 +573,7 @@ class EncryptedJSONField(EncryptedFieldMixin, models.JSONField):
         if (
             value is None
             or not isinstance(value, str)
-            or hasattr(self, "_already_decrypted")
+            or ((cleaning := _cleaning.get()) and self in cleaning)
         ):
             return value
         try:
@@ -1,6 +1,7 @@
 from django.db import models
 
 from encrypted_fields.fields import (
+    EncryptedBinaryField,
     EncryptedBooleanField,
     EncryptedCharField,
     EncryptedDateField,
@@ -23,3 +24,4 @@ class TestModel(models.Model):
     email = EncryptedEmailField(null=True, blank=True)
     boolean = EncryptedBooleanField(default=False, null=True)
     json = EncryptedJSONField(default=dict, null=True, blank=True)
+    binary = EncryptedBinaryField(null=True, blank=True)
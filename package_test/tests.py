@@ -1,12 +1,31 @@
+import base64
 import json
+import os
 import re
+from collections import OrderedDict
+from unittest import mock
 
 import pytest
-from django.core.exceptions import ValidationError
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+from django.core import serializers
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import MaxValueValidator
 from django.db import connection
 from django.test import TestCase, override_settings
 from django.utils import timezone
 
+from encrypted_fields.fields import (
+    _NONCE_POOL_SIZE,
+    _NONCE_SIZE,
+    EncryptedCharField,
+    EncryptedIntegerField,
+    EncryptedJSONField,
+    EncryptedTextField,
+    _derive_legacy_key,
+    _next_nonce,
+)
+
 from .models import TestModel
 
 
@@ -102,6 +121,18 @@ class FieldTest(TestCase):
         with pytest.raises(TypeError):
             model.full_clean()
 
+    def test_integer_field_range_validators(self) -> None:
+        field = EncryptedIntegerField()
+        custom_field = EncryptedIntegerField(validators=[MaxValueValidator(100)])
+
+        model_field = TestModel._meta.get_field("integer")
+
+        assert field.validators[-1] is model_field.validators[-1]
+        assert [v.limit_value for v in custom_field.validators] == [
+            100,
+            -2147483648,
+        ]
+
     def test_date_field_encrypted(self) -> None:
         plaintext = timezone.now().date()
 
@@ -168,6 +199,64 @@ class FieldTest(TestCase):
         with pytest.raises(ValidationError):
             model.full_clean()
 
+    def test_encrypt_without_encrypt_into(self) -> None:
+        text_field = TestModel._meta.get_field("text")
+        plaintext = "Oh hi, test reader!"
+
+        with mock.patch("encrypted_fields.fields._HAS_ENCRYPT_INTO", new=False):
+            ciphertext = text_field.encrypt_value(plaintext)
+
+        assert len(ciphertext) == len(text_field.encrypt_value(plaintext))
+        assert text_field.decrypt_value(ciphertext) == plaintext
+
+    def test_decrypt_without_buffer_support(self) -> None:
+        text_field = TestModel._meta.get_field("text")
+        plaintext = "Oh hi, test reader!"
+        ciphertext = text_field.encrypt_value(plaintext)
+
+        with mock.patch("encrypted_fields.fields._AEAD_ACCEPTS_BUFFERS", new=False):
+            assert text_field.decrypt_value(ciphertext) == plaintext
+
+    def test_fields_share_derived_keys(self) -> None:
+        text_field = TestModel._meta.get_field("text")
+        char_field = TestModel._meta.get_field("char")
+
+        assert text_field.keys[0] is char_field.keys[0]
+        assert text_field.legacy_keys[0] is char_field.legacy_keys[0]
+
+    def test_plain_text_is_returned_as_is(self) -> None:
+        text_field = TestModel._meta.get_field("text")
+
+        assert text_field.decrypt_value("Oh hi, test reader!") == "Oh hi, test reader!"
+        assert text_field.decrypt_value("abc") == "abc"
+
+        with pytest.raises(ValueError):
+            text_field.decrypt_value("dGVzdA==")
+
+    def test_failed_clean_does_not_disable_decryption(self) -> None:
+        plaintext = "test@gmail.com"
+        model = TestModel.objects.create(email=plaintext)
+
+        model.email = "text"
+        with pytest.raises(ValidationError):
+            model.full_clean()
+
+        fresh_model = TestModel.objects.get(id=model.id)
+        assert fresh_model.email == plaintext
+
+    def test_other_fields_decrypt_while_cleaning(self) -> None:
+        plaintext = "secret text"
+        model = TestModel.objects.create(text=plaintext)
+        seen = []
+
+        def validator(value: str) -> None:  # noqa: ARG001
+            seen.append(TestModel.objects.get(id=model.id).text)
+
+        char_field = EncryptedCharField(max_length=255, validators=[validator])
+        char_field.clean("Oh hi, test reader!", None)
+
+        assert seen == [plaintext]
+
     def test_boolean_field_encrypted(self) -> None:
         plaintext = True
 
@@ -196,6 +285,35 @@ class FieldTest(TestCase):
         with pytest.raises(ValidationError):
             model.save()
 
+    def test_binary_field_encrypted(self) -> None:
+        plaintext = b"Oh hi, test reader!"
+
+        model = TestModel()
+        model.binary = plaintext
+        model.full_clean()
+        model.save()
+
+        ciphertext = bytes(self.get_db_value("binary", model.id))
+
+        assert plaintext not in ciphertext
+        # Key id, raw nonce, ciphertext and tag without any base64 overhead.
+        assert len(ciphertext) == 1 + _NONCE_SIZE + len(plaintext) + 16
+
+        fresh_model = TestModel.objects.get(id=model.id)
+        assert bytes(fresh_model.binary) == plaintext
+
+    def test_binary_field_serialization(self) -> None:
+        plaintext = b"Oh hi, test reader!"
+        model = TestModel.objects.create(binary=plaintext)
+
+        data = serializers.serialize("json", [model])
+        TestModel.objects.all().delete()
+        for obj in serializers.deserialize("json", data):
+            obj.save()
+
+        fresh_model = TestModel.objects.get(id=model.id)
+        assert bytes(fresh_model.binary) == plaintext
+
     def test_json_field_encrypted(self) -> None:
         dict_values = {
             "key": "value",
@@ -227,6 +345,170 @@ class FieldTest(TestCase):
 
         assert plain_value.keys() == ciphertext.keys()
 
+    def test_json_field_encrypts_container_subclasses(self) -> None:
+        plain_value = OrderedDict(key="value", nested=OrderedDict(child=1))
+
+        model = TestModel()
+        model.json = plain_value
+        model.save()
+
+        ciphertext = json.loads(self.get_db_value("json", model.id))
+
+        assert ciphertext["key"] != "value"
+        assert ciphertext["nested"]["child"] != 1
+
+        fresh_model = TestModel.objects.get(id=model.id)
+        assert fresh_model.json == {"key": "value", "nested": {"child": "1"}}
+
+    def test_json_field_custom_encoder(self) -> None:
+        field = EncryptedJSONField(encoder=DjangoJSONEncoder)
+        value = {"date": timezone.now().date()}
+
+        ciphertext = json.loads(field.get_prep_value(value))
+
+        assert field.decrypt_value(ciphertext["date"]) == str(value["date"])
+
+    def test_json_field_does_not_modify_value(self) -> None:
+        plain_value = {"list": ["nested", {"key": "val"}], "key": "value"}
+        expected = json.loads(json.dumps(plain_value))
+
+        model = TestModel()
+        model.json = plain_value
+        model.save()
+
+        assert plain_value == expected
+
+        fresh_model = TestModel.objects.get(id=model.id)
+        assert fresh_model.json == expected
+        assert list(fresh_model.json) == ["list", "key"]
+
+
+class CipherTestCase(TestCase):
+    @override_settings(ENCRYPTED_FIELDS_CIPHER="chacha20")
+    def test_chacha20_value_is_decrypted_with_either_setting(self) -> None:
+        plaintext = "Oh hi test reader"
+        chacha_field = EncryptedTextField()
+        ciphertext = chacha_field.encrypt_value(plaintext)
+
+        encrypted = base64.urlsafe_b64decode(ciphertext)
+        chacha20 = ChaCha20Poly1305(chacha_field.keys[0])
+        decrypted = chacha20.decrypt(encrypted[1:13], encrypted[13:], None)
+        assert decrypted == plaintext.encode("utf-8")
+        assert chacha_field.decrypt_value(ciphertext) == plaintext
+
+        text_field = TestModel._meta.get_field("text")
+        aesgcm_ciphertext = text_field.encrypt_value(plaintext)
+        assert text_field.decrypt_value(ciphertext) == plaintext
+        assert chacha_field.decrypt_value(aesgcm_ciphertext) == plaintext
+
+    @override_settings(ENCRYPTED_FIELDS_CIPHER="des")
+    def test_unknown_cipher(self) -> None:
+        with pytest.raises(ImproperlyConfigured):
+            EncryptedTextField().encrypt_value("Oh hi test reader")
+
+
+class BulkDecryptTestCase(TestCase):
+    def test_bulk_decrypt(self) -> None:
+        text_field = TestModel._meta.get_field("text")
+        plaintexts = [f"Oh hi test reader {i}" for i in range(1000)]
+        ciphertexts = [text_field.encrypt_value(value) for value in plaintexts]
+
+        with mock.patch("os.cpu_count", return_value=4):
+            assert text_field.bulk_decrypt(ciphertexts) == plaintexts
+            assert text_field.bulk_decrypt(ciphertexts[:3]) == plaintexts[:3]
+        assert text_field.bulk_decrypt([]) == []
+
+    def test_bulk_decrypt_passes_null_through(self) -> None:
+        text_field = TestModel._meta.get_field("text")
+        json_field = TestModel._meta.get_field("json")
+        plaintexts = ["Oh hi test reader", None] * 500
+        json_values = [{"key": "value"}, None] * 500
+        ciphertexts = [text_field.get_prep_value(value) for value in plaintexts]
+        json_ciphertexts = [
+            None if value is None else json_field.get_prep_value(value)
+            for value in json_values
+        ]
+
+        with mock.patch("os.cpu_count", return_value=4):
+            assert text_field.bulk_decrypt(ciphertexts) == plaintexts
+            assert json_field.bulk_decrypt(json_ciphertexts) == json_values
+        assert text_field.bulk_decrypt(ciphertexts[:2]) == plaintexts[:2]
+
+    def test_bulk_decrypt_json(self) -> None:
+        json_field = TestModel._meta.get_field("json")
+        plain_values = [{"key": f"value {i}", "list": [i]} for i in range(1000)]
+        stored_values = [json_field.get_prep_value(value) for value in plain_values]
+
+        with mock.patch("os.cpu_count", return_value=4):
+            decrypted = json_field.bulk_decrypt(stored_values)
+
+        assert decrypted == [
+            {"key": f"value {i}", "list": [str(i)]} for i in range(1000)
+        ]
+
+    def test_bulk_decrypt_raises_on_invalid_value(self) -> None:
+        text_field = TestModel._meta.get_field("text")
+        ciphertexts = [text_field.encrypt_value("Oh hi test reader")] * 1000
+        ciphertexts[500] = base64.urlsafe_b64encode(os.urandom(64)).decode("utf-8")
+
+        with mock.patch("os.cpu_count", return_value=4), pytest.raises(ValueError):
+            text_field.bulk_decrypt(ciphertexts)
+
+
+class NonceTestCase(TestCase):
+    def test_nonces_are_unique_across_refills(self) -> None:
+        count = 3 * _NONCE_POOL_SIZE // _NONCE_SIZE
+        nonces = [_next_nonce() for _ in range(count)]
+
+        assert all(len(nonce) == _NONCE_SIZE for nonce in nonces)
+        assert len(set(nonces)) == count
+
+
+class LegacyKeyTestCase(TestCase):
+    def test_pbkdf2_value_is_decrypted(self) -> None:
+        """Values written with the old PBKDF2 derived keys remain readable"""
+        plaintext = "Oh hi test reader"
+        text_field = TestModel._meta.get_field("text")
+        nonce = os.urandom(12)
+        ciphertext = AESGCM(text_field.legacy_keys[0]).encrypt(
+            nonce, plaintext.encode("utf-8"), None
+        )
+        legacy_value = base64.urlsafe_b64encode(nonce + ciphertext).decode("utf-8")
+
+        model = TestModel.objects.create()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "update package_test_testmodel set text = %s where id = %s;",
+                [legacy_value, model.id],
+            )
+
+        fresh_model = TestModel.objects.get(id=model.id)
+        assert fresh_model.text == plaintext
+
+    def test_untagged_value_is_decrypted(self) -> None:
+        """Values written before the key id prefix remain readable"""
+        plaintext = "Oh hi test reader"
+        text_field = TestModel._meta.get_field("text")
+        nonce = os.urandom(12)
+        ciphertext = AESGCM(text_field.keys[0]).encrypt(
+            nonce, plaintext.encode("utf-8"), None
+        )
+        untagged_value = base64.urlsafe_b64encode(nonce + ciphertext).decode("utf-8")
+
+        assert text_field.decrypt_value(untagged_value) == plaintext
+
+    @override_settings(SALT_KEY=["newkeyhere", "xyz"])
+    def test_legacy_keys_derived_in_parallel(self) -> None:
+        text_field = EncryptedTextField()
+
+        with mock.patch("os.cpu_count", return_value=4):
+            legacy_keys = text_field.legacy_keys
+
+        assert legacy_keys == [
+            _derive_legacy_key(b"abc", b"newkeyhere"),
+            _derive_legacy_key(b"abc", b"xyz"),
+        ]
+
 
 class RotatedSaltTestCase(TestCase):
     @classmethod
@@ -262,11 +544,19 @@ class RotatedSecretKeyTestCase(TestCase):
     @staticmethod
     def clear_cached_properties():
         # we have to clear the cached properties of EncryptedFieldMixin so we have the right encryption keys
-        text_field = TestModel._meta.get_field('text')
-        if hasattr(text_field, 'keys'):
-            del text_field.keys
-        if hasattr(text_field, 'f'):
-            del text_field.f
+        text_field = TestModel._meta.get_field("text")
+        for name in (
+            "keys",
+            "legacy_keys",
+            "_aesgcms",
+            "_legacy_aesgcms",
+            "_cipher",
+            "_aead",
+            "_aeads_by_id",
+            "_key_prefix",
+            "f",
+        ):
+            text_field.__dict__.pop(name, None)
 
     @classmethod
     @override_settings(SECRET_KEY="oldkey")